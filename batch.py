@@ -0,0 +1,55 @@
+# batch.py
+"""批量转换入口（命令行，无 GUI 依赖）
+
+遍历输入目录下的所有 .md / .pdf 文件，逐个调用
+FileProcessor.process_file 生成标准化的 Markdown 文档。
+
+与 main.pyw 不同，本入口不导入 PyQt5，热路径上只有纯 Python
+的字符串/正则处理，因此可以直接用 PyPy 运行以加速大批量迁移：
+
+    pypy3 batch.py <输入目录> <输出目录>
+
+元数据推断规则：
+  - .md 文件：标题取文件内的一级标题（没有则用文件名）
+  - .pdf 文件：标题取文件名（不含扩展名）
+  - 描述默认与标题相同，标签为空
+"""
+
+import sys
+from pathlib import Path
+
+from file_processor import FileProcessor
+
+
+def build_metadata(path: Path) -> dict:
+    """根据文件本身推断元数据（批量模式下无人工填写）
+
+    :param path: 输入文件路径
+    :return: 供 FileProcessor.process_file 使用的元数据字典
+    """
+    if path.suffix.lower() == '.md':
+        title = FileProcessor.extract_title_from_md(str(path)) or path.stem
+    else:
+        title = path.stem
+    return {'title': title, 'description': title, 'tags': []}
+
+
+def batch_convert(in_dir: str, out_dir: str) -> int:
+    """批量处理 in_dir 下的所有 md/pdf 文件（多进程并行）
+
+    :param in_dir: 输入目录
+    :param out_dir: 输出目录
+    :return: 成功处理的文件数
+    """
+    results = FileProcessor.process_directory(in_dir, out_dir, build_metadata)
+    for dest in results:
+        print(f'已生成：{dest}')
+    return len(results)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print(f'用法：python {sys.argv[0]} <输入目录> <输出目录>', file=sys.stderr)
+        sys.exit(1)
+    n = batch_convert(sys.argv[1], sys.argv[2])
+    print(f'共处理 {n} 个文件')
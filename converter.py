@@ -1,6 +1,33 @@
 import re
 from config import standard_output_style
 
+# 模块级预编译正则，避免每次调用时重复查询 re 内部缓存
+# 冲突字符清洗的单遍扫描模式：带转义字符的上下标 | 单字符上下标 | 连续空格
+# （竖线是纯字面替换，用 str.replace 预处理，不进正则）
+_SANITIZE_RE = re.compile(r'(?:(_|\^)(\\[a-zA-Z]+)\b)|(?:([_^])([^{}\s\\]))|( {2,})')
+# 行内公式的两种写法（\(...\) 与 $...$，排除转义情况）合并为一个交替模式，
+# 单遍扫描即可完成全部行内转换
+_INLINE_RE = re.compile(
+    r'(?<!\\)\\\((.*?)(?<!\\)\\\)|(?<!\\)\$(?!\s)([^$]+?)(?<!\s)\$(?!\$)',
+    re.DOTALL
+)
+# 块公式结构，紧凑写法省去 VERBOSE 模式的解析开销，各分组含义：
+#   (^[> ]*)                                  捕获可能的引用符号(包含多级>)-group 1
+#   \s*                                       可能的空格
+#   (\\begin\{equation\*\}|\\\[|\$\$|\$\$\$)  开始标记-group 2
+#   (.*?)                                     公式内容（非贪婪）-group 3
+#   (\\end\{equation\*\}|\\\]|\$\$|\$\$\$)    结束标记-group 4
+#   [^\S\n]*                                  可能的空格（换行除外）
+#   ((?:\n|$))                                捕获后续可能的换行符-group 5
+_BLOCK_RE = re.compile(
+    r'(^[> ]*)\s*(\\begin\{equation\*\}|\\\[|\$\$|\$\$\$)(.*?)'
+    r'(\\end\{equation\*\}|\\\]|\$\$|\$\$\$)[^\S\n]*((?:\n|$))',
+    re.DOTALL | re.MULTILINE
+)
+_TRIPLE_NL_RE = re.compile(r'\n{3,}')
+# 连续出现的同层级引用空行（如 "> >"），借助反向引用只保留一行
+_QUOTE_BLANK_RUN_RE = re.compile(r'(^[ \t]*>(?:[ \t]*>)*[ \t]*$\n)(?:\1)+', re.MULTILINE)
+
 
 class MathJax_Converter:
     """
@@ -82,6 +109,12 @@ class MathJax_Converter:
         :param input_text: 原始文本（包含 LaTeX 公式）
         :return: MathJax 兼容的 Markdown 文本
         """
+        # 快速通道：没有任何数学标记时跳过公式转换，只做空行合并
+        # （str 的 in 判断是 C 层子串扫描，远比跑正则便宜）
+        if ('$' not in input_text and '\\(' not in input_text
+                and '\\[' not in input_text and '\\begin{equation' not in input_text):
+            return MathJax_Converter._merge_consecutive_empty_lines(input_text)
+
         # text = self._convert_custom_environments(input_text) # 此行代码供转化LaTeX使用
         text = self._convert_block_math(input_text)
         text = MathJax_Converter._merge_consecutive_empty_lines(text)
@@ -89,43 +122,19 @@ class MathJax_Converter:
         return text
 
     def _convert_inline_math(self, text: str) -> str:
-        """转换行内公式（如 \(...\) 或 $...$）"""
-        # 处理\(...\)格式
-        text = re.sub(
-            r'(?<!\\)\\\((.*?)(?<!\\)\\\)',
-            lambda m: f'{self.style["math_inline_surrounding"]}%s{self.style["math_inline_surrounding"]}' % self._sanitize_special_chars(m.group(1)),
-            text,
-            flags=re.DOTALL
-        )
-        
-        # 处理$...$格式（排除转义情况）
-        text = re.sub(
-            r'(?<!\\)\$(?!\s)([^$]+?)(?<!\s)\$(?!\$)',
-            lambda m: f'{self.style["math_inline_surrounding"]}%s{self.style["math_inline_surrounding"]}' % self._sanitize_special_chars(m.group(1)),
-            text,
-            flags=re.DOTALL
-        )
-        
-        return text
+        """转换行内公式（如 \(...\) 或 $...$），两种写法在一遍扫描中处理"""
+        surrounding = self.style["math_inline_surrounding"]
+
+        def _replace_inline(m):
+            # group 1 为 \(...\) 的内容，group 2 为 $...$ 的内容（可能为空串）
+            content = m.group(1) if m.group(1) is not None else m.group(2)
+            return f'{surrounding}{self._sanitize_special_chars(content)}{surrounding}'
+
+        return _INLINE_RE.sub(_replace_inline, text)
 
     def _convert_block_math(self, text: str) -> str:
         """转换块级数学公式，保留引用层级并处理格式"""
-        # 匹配包含换行的块公式结构（兼容引用环境和常规环境）
-        block_pattern = re.compile(
-            r'''
-            (^[> ]*)               # 捕获可能的引用符号(包含多级>)-group 1
-            \s*                    # 可能的空格
-            (\\begin\{equation\*\}|\\\[|\$\$|\$\$\$)  # 开始标记-group 2
-            (.*?)                  # 公式内容（非贪婪）-group 3
-            (\\end\{equation\*\}|\\\]|\$\$|\$\$\$)    # 结束标记-group 4
-            [^\S\n]*               # 可能的空格（换行除外）
-            (                      # 捕获后续可能的换行符
-            (?:\n|$)               # 匹配换行或文本结束
-            )
-            ''', 
-            re.DOTALL | re.MULTILINE | re.VERBOSE
-        )
-
+        # 匹配包含换行的块公式结构（兼容引用环境和常规环境），见模块级 _BLOCK_RE
         def _replace_block(match):
             indent = match.group(1).strip()       # 保留原有的引用符号 >
             content = match.group(3) #.strip()
@@ -146,65 +155,33 @@ class MathJax_Converter:
             # return re.sub(r'\n{3,}', '\n\n', new_block) + trailing_newline
             return new_block + trailing_newline
 
-        return block_pattern.sub(_replace_block, text)
+        return _BLOCK_RE.sub(_replace_block, text)
 
     def _sanitize_special_chars(self, text: str) -> str:
         """转义 Markdown 特殊字符冲突（如 *_| 等）"""
-        # 处理竖线替换为\vert
-        text = re.sub(r'\|', r'\\vert ', text)
-        
-        # 处理未加括号的上下标（需要分两次匹配确保优先级）
-        patterns = [
-            # 处理带转义字符的情况（如 \alpha）
-            (r'(_|\^)(\\[a-zA-Z]+)\b', r'\1{\2}'),
-            # 处理单个字符的情况（非空格非花括号）
-            (r'([_^])([^{}\s\\])', r'\1{\2}')
-        ]
-        
-        for pattern, replacement in patterns:
-            text = re.sub(pattern, replacement, text)
-        
-        # 合并连续空格（保留单个空格）
-        text = re.sub(r' {2,}', ' ', text)
-        
-        return text
+        # 处理竖线替换为\vert（字面替换走 C 层的 str.replace，比正则快得多）
+        text = text.replace('|', '\\vert ')
+
+        # 单遍扫描完成其余替换（按分组区分匹配到的情况）：
+        # 1. 带转义字符的上下标加花括号（如 _\alpha → _{\alpha}）
+        # 2. 单个字符的上下标加花括号（非空格非花括号）
+        # 3. 合并连续空格（保留单个空格）
+        def _dispatch(m):
+            if m.group(1):
+                return f'{m.group(1)}{{{m.group(2)}}}'
+            if m.group(3):
+                return f'{m.group(3)}{{{m.group(4)}}}'
+            return ' '
+
+        return _SANITIZE_RE.sub(_dispatch, text)
 
     @staticmethod
     def _merge_consecutive_empty_lines(text: str) -> str:
-        """合并连续空行，保留最浅引用层级"""
-        result = []
-        current_group = []  # 存储连续空行及其层级
-
-        def get_level(line: str) -> int:
-            stripped = line.strip()
-            if not stripped:
-                return 0  # 普通空行
-            clean = stripped.replace(" ", "")
-            if all(c == ">" for c in clean):
-                return len(clean)  # 引用空行层级
-            return -1  # 非空行
-
-        for line in text.split("\n"):
-            level = get_level(line)
-            if level >= 0:  # 空行
-                current_group.append((line, level))
-            else:
-                if current_group:
-                    min_level = min(lev for (_, lev) in current_group)
-                    empty_line = "" if min_level == 0 else "> " * min_level
-                    result.append(empty_line.strip())
-                    current_group = []
-                result.append(line)
-        
-        # 处理最后一批连续空行
-        if current_group:
-            min_level = min(lev for (_, lev) in current_group)
-            empty_line = "" if min_level == 0 else ">" * min_level
-            result.append(empty_line)
-        
+        """合并连续空行，保留引用层级（全程在 re 引擎内完成，无逐行 Python 循环）"""
+        # 同层级的引用空行连续出现时只保留一行
+        text = _QUOTE_BLANK_RUN_RE.sub(r'\1', text)
         # 合并残留的连续空行
-        processed = "\n".join(result)
-        return re.sub(r'(\n{3,})', '\n\n', processed)
+        return _TRIPLE_NL_RE.sub('\n\n', text)
 
 # 测试用代码
 if __name__ == '__main__':
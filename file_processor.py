@@ -1,5 +1,5 @@
 # file_processor.py
-import re,os.path,os,shutil
+import re,os.path,os,sys
 from datetime import datetime
 from pathlib import Path
 
@@ -7,6 +7,24 @@ import converter
 from tools.MyYaml import dump as yaml_dump
 from config import pdf_storage_dir
 
+# 模块级预编译正则，批量处理时避免重复编译/缓存查询
+_COLON_RE = re.compile(r':+')
+_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+# 目录移除拆成两个专用模式：
+#   1. [TOC]/[[TOC]]/{:toc} 等标记（忽略大小写即可覆盖原先的全部写法变体）
+#   2. 紧挨标题前的列表式目录；逐行锚定（MULTILINE的^），'.'不跨行，
+#      避免贪婪的 .*\n 配合前瞻 (?=\n*#) 引发跨越正文的灾难性回溯
+_TOC_MARKER_RE = re.compile(r'\n*\[TOC\]\n*|\n*\[\[TOC\]\]\n*|\n*\{:\s*toc\s*\}\n*', re.I)
+_TOC_LIST_RE = re.compile(r'(?:^(?: {0,3}-| {0,3}\d+\.) .*\n)+(?=\n*#)', re.M)
+# 文件名非法字符/空白 → '-' 的单字符映射表（含常见的全角空格、不换行空格），
+# 纯字符级替换用 str.translate 即可；压缩连字符串的模式连同 \s 一起匹配，
+# 把映射表没覆盖到的其余Unicode空白（如窄空格、行分隔符）也一并换成 '-'
+_SLUG_TABLE = str.maketrans({c: '-' for c in '\\/:*?"<>| \t\n\r\f\v\xa0　'})
+_DASH_RUN_RE = re.compile(r'[-\s]+')
+
+# 公式转换器无逐次调用的可变状态，进程内共享一个实例即可
+_CONVERTER = converter.MathJax_Converter()
+
 
 class FileProcessor:
     """核心文件处理逻辑（无 GUI 依赖）
@@ -58,10 +76,11 @@ class FileProcessor:
         :raises 其他异常: 文件操作或处理过程中可能出现的异常
         """
         # 将metadata['title']中的冒号替换为'-'
-        metadata['title'] = re.sub(r':+', '-', metadata['title']).strip()
+        metadata['title'] = _COLON_RE.sub('-', metadata['title']).strip()
 
-        metadata['time'] = datetime.fromtimestamp(
-            os.path.getmtime(input_path)).strftime("%Y-%m-%d %H:%M:%S")
+        # 同时保留datetime对象，后续生成文件名时无需再strptime解析一遍
+        metadata['time_dt'] = datetime.fromtimestamp(os.path.getmtime(input_path))
+        metadata['time'] = metadata['time_dt'].strftime("%Y-%m-%d %H:%M:%S")
 
         _, ext = os.path.splitext(input_path.lower())
         if ext == '.md':
@@ -82,6 +101,45 @@ class FileProcessor:
                 f.write(body)
         return str(dest)
 
+    @staticmethod
+    def process_directory(in_dir: str, out_dir: str, metadata_factory,
+                          max_workers: int | None = None) -> list[str]:
+        """
+        并行批量处理目录下的所有Markdown/PDF文件
+
+        每个文件的转换相互独立，且瓶颈在正则/字符串处理（CPU密集），
+        因此用进程池绕开GIL把工作分摊到多核。
+
+        :param in_dir: 输入目录路径
+        :param out_dir: 输出目录路径
+        :param metadata_factory: 可调用对象，接收输入文件的Path、
+            返回该文件的元数据字典（在主进程中调用，避免跨进程传递函数）
+        :param max_workers: 进程数（默认为CPU核心数）
+        :return: 成功生成的Markdown文件完整路径列表（按输入文件名排序）；
+            单个文件失败不中断批量处理，错误信息打印到stderr后跳过
+        """
+        from concurrent.futures import ProcessPoolExecutor  # 延迟导入：仅批量模式需要
+
+        entries = [e for e in sorted(Path(in_dir).iterdir())
+                   if e.is_file() and e.suffix.lower() in ('.md', '.pdf')]
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            # 元数据构建（主进程侧）也可能失败（如文件编码问题），同样按单文件跳过
+            futures = []
+            for entry in entries:
+                try:
+                    futures.append((entry, pool.submit(FileProcessor.process_file,
+                                                       str(entry), out_dir,
+                                                       metadata_factory(entry))))
+                except Exception as e:
+                    print(f'处理失败 {entry}：{e}', file=sys.stderr)
+            for entry, future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f'处理失败 {entry}：{e}', file=sys.stderr)
+        return results
+
     # 供 GUI 快速提取标题
     @staticmethod
     def extract_title_from_md(path: str) -> str | None:
@@ -93,9 +151,13 @@ class FileProcessor:
         :param path: Markdown文件路径
         :return: 提取的标题（找到一级标题时）或None（未找到时）
         """
+        # 逐行读取，找到标题即返回，避免为开头几行把大文件整个读入内存
         with open(path, encoding='utf-8') as f:
-            m = re.search(r'^#\s+(.+)$', f.read(), re.MULTILINE)
-        return m.group(1).strip() if m else None
+            for line in f:
+                m = _H1_RE.match(line)
+                if m:
+                    return m.group(1).strip()
+        return None
 
     # ---------- 私有工具 ----------
     @staticmethod
@@ -119,26 +181,21 @@ class FileProcessor:
             content = f.read()
 
         # 提取标题
-        m = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        m = _H1_RE.search(content)
         if not m:
             raise ValueError("未找到一级标题（# Title）")
         title = m.group(1).strip()
         # 上一行代码不知道有什么用
 
         # 移除原文标题行
-        content = re.sub(r'^#\s+.+$', '', content, count=1, flags=re.MULTILINE)
-
-        # 移除原文目录
-        content = re.sub(
-            r'(?si)(?:\n*\[TOC\]\n*|\n*\[\[TOC\]\]\n*|\n*\{:\s*toc\s*\}\n*|'
-            r'\n*\[toc\]\n*|\n*\[ToC\]\n*|\n*\[to[cC]\]\n*|'
-            r'(?:(?:^|\n)(?: {0,3}-| {0,3}\d+\.) .*\n)+(?=\n*#))',
-            '\n',
-            content
-        )
+        content = _H1_RE.sub('', content, count=1)
+
+        # 移除原文目录（标记与列表式目录分两遍处理）
+        content = _TOC_MARKER_RE.sub('\n', content)
+        content = _TOC_LIST_RE.sub('', content)
 
         # 公式转换
-        body = converter.MathJax_Converter().convert(content)
+        body = _CONVERTER.convert(content)
 
         front_matter = {
             'layout': metadata.get('layout', 'post'),
@@ -167,20 +224,24 @@ class FileProcessor:
             - front_matter: 生成的YAML格式字符串
             - body: 空字符串（PDF处理不生成正文内容）
         """
+        import shutil  # 延迟导入：仅处理PDF时需要，纯Markdown批量转换不必付导入开销
+
         base_dir = Path(output_dir).parent
         dest_dir = base_dir / pdf_storage_dir
         dest_dir.mkdir(parents=True, exist_ok=True)
         pdf_name = Path(input_path).name
-        dest_path = dest_dir / pdf_name
 
-        # 解决重名
+        # 解决重名：目录只列一次，在集合里探测候选名，避免每次尝试都 stat 文件系统
+        existing = {entry.name for entry in os.scandir(dest_dir)}
+        stem, suffix = Path(pdf_name).stem, Path(pdf_name).suffix
         counter = 1
-        while dest_path.exists():
-            stem, suffix = Path(pdf_name).stem, Path(pdf_name).suffix
-            dest_path = dest_dir / f"{stem}_{counter}{suffix}"
+        while pdf_name in existing:
+            pdf_name = f"{stem}_{counter}{suffix}"
             counter += 1
+        dest_path = dest_dir / pdf_name
 
-        shutil.copy2(input_path, dest_path)
+        # 只拷贝数据不拷贝元数据（时间戳/权限），front matter里有自己的日期
+        shutil.copyfile(input_path, dest_path)
 
         # 计算相对路径（pdf存储位置相对于output_dir）
         rel_path = os.path.relpath(dest_path, start=output_dir)
@@ -208,11 +269,13 @@ class FileProcessor:
           2. 标题中的空格替换为连字符(-)
           3. 移除特殊字符
         
-        :param metadata: 元数据字典（需包含'title'和'time'）
+        :param metadata: 元数据字典（需包含'title'和'time'，可选'time_dt'）
         :return: 生成的标准化文件名
         """
-        date_str = datetime.strptime(metadata['time'],"%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
-        title_slug = re.sub(r'[\\/:\*\?"<>\|\s]+', '-', metadata['title']).strip().strip('-')
+        # process_file已存入解析好的datetime对象；外部直接调用时回退到strptime
+        time_dt = metadata.get('time_dt') or datetime.strptime(metadata['time'], "%Y-%m-%d %H:%M:%S")
+        date_str = time_dt.strftime("%Y-%m-%d")
+        title_slug = _DASH_RUN_RE.sub('-', metadata['title'].translate(_SLUG_TABLE)).strip('-')
         return f"{date_str}-{title_slug}.md"
     
 if __name__ == '__main__':
@@ -43,9 +43,15 @@
 """
 
 import os,re
-from PyQt5.QtWidgets import *
+from PyQt5.QtWidgets import (
+    QMainWindow, QWidget, QLabel, QPushButton, QLineEdit, QTextEdit,
+    QMessageBox, QVBoxLayout, QHBoxLayout, QFileDialog,
+)
 from PyQt5.QtCore import QSettings  # 用于记住上次路径
 
+# 标签分隔符（逗号/空白/中文逗号），预编译避免每次提交重新编译
+_TAG_SPLIT_RE = re.compile(r'[,\s，]+')
+
 
 class MainWindow(QMainWindow):
     # 改为 QMainWindow 便于扩展
@@ -218,7 +224,7 @@ class MainWindow(QMainWindow):
             'title': self.edit_title.text().strip(),
             'description': self.edit_desc.toPlainText().strip(),
             # 'tags': [t.strip() for t in self.edit_tags.text().split(',') if t.strip()],
-            'tags': re.split(r'[,\s，]+', self.edit_tags.text())
+            'tags': _TAG_SPLIT_RE.split(self.edit_tags.text())
         }
 
         self.on_submit(file_path, meta)
\ No newline at end of file
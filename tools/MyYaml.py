@@ -1,32 +1,45 @@
 # 没有装PyYaml模块，自己写一个代替的
+
+# 常见深度的缩进串预先算好，递归中直接查表
+_INDENTS = tuple("  " * i for i in range(32))
+
+
 def dump(data:dict,indent=0) -> str:
     '''代替PyYaml模块中的dump函数，但只实现了将键和值为字符串、字典、列表的字典转化为文本'''
-    yaml_str = ""
-    space = "  " * indent  # 缩进量
-    
+    out = []
+    _dump(data, indent, out)
+    return "".join(out)
+
+def _dump(data, indent, out):
+    '''递归地把各片段追加到 out 列表，最后一次性 join，避免字符串 += 的反复重分配'''
+    space = _INDENTS[indent] if indent < 32 else "  " * indent  # 缩进量
+
     if isinstance(data, dict):
         for key, value in data.items():
             if isinstance(value, (dict, list)):
-                yaml_str += f"{space}{key}:\n{dump(value, indent + 1)}"
+                out.append(f"{space}{key}:\n")
+                _dump(value, indent + 1, out)
             else:
-                yaml_str += f"{space}{key}: {format_value(value)}\n"
+                out.append(f"{space}{key}: {format_value(value)}\n")
     elif isinstance(data, list):
         for item in data:
             if isinstance(item, (dict, list)):
-                yaml_str += f"{space}\n{dump(item, indent + 1)}"
+                out.append(f"{space}\n")
+                _dump(item, indent + 1, out)
             else:
-                yaml_str += f"{space}{format_value(item)}\n"
-    return yaml_str
+                out.append(f"{space}{format_value(item)}\n")
+
+# 按具体类型查表分发，比逐个 isinstance 判断快；type(True) is bool，无需顾虑 bool/int 次序
+_FMT = {
+    type(None): lambda v: "null",
+    bool: lambda v: "true" if v else "false",
+    int: str,
+    float: str,
+    str: str,  # 字符串类型直接输出（未处理特殊字符）
+}
 
 def format_value(value):
-    if value is None:
-        return "null"
-    elif isinstance(value, bool):
-        return "true" if value else "false"
-    elif isinstance(value, (int, float)):
-        return str(value)
-    else:
-        return str(value)  # 字符串类型直接输出（未处理特殊字符）
+    return _FMT.get(type(value), str)(value)
 
 # 示例用法
 if __name__ == '__main__':